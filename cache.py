@@ -0,0 +1,114 @@
+"""
+cache.py
+
+Small helpers for the on-disk caches used by the app.
+
+Re-uploading the same meeting should not pay for Whisper and the
+embeddings API again, so results are stored under a content hash:
+
+- audio file bytes  -> transcript text   (TRANSCRIPT_CACHE_DIR)
+- transcript text   -> saved FAISS index (VECTOR_STORE_CACHE_DIR)
+
+The model name (and, for indexes, the settings that shape the saved
+index) is mixed into every key, so changing them never returns stale
+results.
+
+Hashing uses BLAKE3 when the `blake3` package is installed (SIMD, several
+times faster than SHA-256 on long inputs) and falls back to SHA-256.
+"""
+
+from pathlib import Path
+
+try:
+    from blake3 import blake3 as _new_hasher
+except ImportError:  # optional speed-up; hashlib is always available
+    from hashlib import sha256 as _new_hasher
+
+from config import (
+    OPENAI_EMBEDDING_MODEL,
+    OPENAI_WHISPER_MODEL,
+    TRANSCRIPT_CACHE_DIR,
+    VECTOR_STORE_CACHE_DIR,
+)
+
+# Read audio files in 1 MiB blocks so we never hold the whole file in memory
+_FILE_READ_BLOCK_SIZE = 1 << 20
+
+# Encode transcripts 256K characters at a time instead of all at once
+_TEXT_ENCODE_SLICE_CHARS = 1 << 18
+
+
+def _hash_text(text: str, *key_parts: str) -> str:
+    """
+    Hex digest of (key_parts..., text).
+
+    The text is encoded to UTF-8 slice by slice, so a multi-MB transcript is
+    never copied into one big bytes object just to be hashed. (Slicing on
+    characters never splits a code point, so the digest is the same as
+    hashing text.encode("utf-8") in one go.)
+    """
+    h = _new_hasher()
+    for part in key_parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    for start in range(0, len(text), _TEXT_ENCODE_SLICE_CHARS):
+        h.update(text[start:start + _TEXT_ENCODE_SLICE_CHARS].encode("utf-8"))
+    return h.hexdigest()
+
+
+def _hash_file(file_path: str, model: str) -> str:
+    """
+    Hex digest of (model, file bytes).
+
+    Reads into one reusable buffer and hashes a memoryview of it,
+    so no new bytes object is allocated per block.
+    """
+    h = _new_hasher()
+    h.update(model.encode("utf-8"))
+    h.update(b"\0")
+
+    buffer = bytearray(_FILE_READ_BLOCK_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while n_read := f.readinto(buffer):
+            h.update(view[:n_read])
+    return h.hexdigest()
+
+
+def transcript_cache_path(audio_path: str) -> Path:
+    """
+    Where the Whisper transcript for this audio file is (or will be) cached.
+
+    Parameters
+    ----------
+    audio_path : str
+        Path to the audio file on disk.
+
+    Returns
+    -------
+    Path
+        Path to a .txt file inside TRANSCRIPT_CACHE_DIR.
+    """
+    key = _hash_file(audio_path, OPENAI_WHISPER_MODEL)
+    return Path(TRANSCRIPT_CACHE_DIR) / f"{key}.txt"
+
+
+def vector_store_cache_path(transcript: str, index_settings: str) -> Path:
+    """
+    Where the FAISS index for this transcript is (or will be) cached.
+
+    Parameters
+    ----------
+    transcript : str
+        Full meeting transcript text.
+    index_settings : str
+        Everything besides the embedding model that changes the saved index
+        (format version, chunking, dedup, index choice). See vector_store.py.
+
+    Returns
+    -------
+    Path
+        A folder inside VECTOR_STORE_CACHE_DIR (index.faiss + index.pkl).
+    """
+    key = _hash_text(transcript, OPENAI_EMBEDDING_MODEL, index_settings)
+    return Path(VECTOR_STORE_CACHE_DIR) / key
@@ -4,6 +4,7 @@ config.py
 Central place to configure:
 - API keys
 - Model names
+- Local cache folders
 - Shared clients for OpenAI and Mistral
 
 We load everything from environment variables so we NEVER hard-code keys.
@@ -17,8 +18,12 @@ from dotenv import load_dotenv
 #      OPENAI_API_KEY=sk-...
 #      OPENAI_WHISPER_MODEL=whisper-1
 #      OPENAI_EMBEDDING_MODEL=text-embedding-3-small
+#      OPENAI_MAX_CONCURRENT_REQUESTS=4
 #      MISTRAL_API_KEY=...
 #      MISTRAL_CHAT_MODEL=mistral-small-latest
+#      MISTRAL_MAX_CONCURRENT_REQUESTS=4
+#      TRANSCRIPT_CACHE_DIR=.transcript_cache
+#      VECTOR_STORE_CACHE_DIR=.vs_cache
 load_dotenv()
 
 
@@ -29,6 +34,10 @@ OPENAI_EMBEDDING_MODEL: str = os.getenv(
     "OPENAI_EMBEDDING_MODEL",
     "text-embedding-3-small",  # good default, cheap & strong
 )
+# How many Whisper requests we run in parallel for long recordings
+OPENAI_MAX_CONCURRENT_REQUESTS: int = int(
+    os.getenv("OPENAI_MAX_CONCURRENT_REQUESTS", "4")
+)
 
 # 🟩 3. Mistral settings
 MISTRAL_API_KEY: str | None = os.getenv("MISTRAL_API_KEY")
@@ -36,9 +45,20 @@ MISTRAL_CHAT_MODEL: str = os.getenv(
     "MISTRAL_CHAT_MODEL",
     "mistral-small-latest",  # you can change this later
 )
+# How many Mistral requests we run in parallel (keep under your key's rate limit)
+MISTRAL_MAX_CONCURRENT_REQUESTS: int = int(
+    os.getenv("MISTRAL_MAX_CONCURRENT_REQUESTS", "4")
+)
+
 
+# 🟨 4. Local cache settings
+#    Re-uploading the same meeting reuses the saved transcript / FAISS index
+#    instead of calling Whisper and the embeddings API again.
+TRANSCRIPT_CACHE_DIR: str = os.getenv("TRANSCRIPT_CACHE_DIR", ".transcript_cache")
+VECTOR_STORE_CACHE_DIR: str = os.getenv("VECTOR_STORE_CACHE_DIR", ".vs_cache")
 
-# 🔒 4. Basic safety checks (optional but helpful for debugging)
+
+# 🔒 5. Basic safety checks (optional but helpful for debugging)
 if OPENAI_API_KEY is None:
     raise ValueError(
         "OPENAI_API_KEY is not set. "
@@ -54,16 +74,40 @@ if MISTRAL_API_KEY is None:
     )
 
 
-# 🧠 5. Create shared API clients
+# 🧠 6. Create shared API clients
 #    - OpenAI client (for Whisper + embeddings + optionally chat)
 #    - Mistral client (for chat/summarization/Q&A)
+#    Both run on pooled HTTP/2 connections, so the many small requests we send
+#    (embedding batches, Whisper segments, chunk summaries) reuse open TLS
+#    connections instead of paying a new handshake each time.
 
+import httpx
 from openai import OpenAI  # official OpenAI Python client
 from mistralai import Mistral  # official Mistral Python client
 
 
+def _build_http_client() -> httpx.Client:
+    """
+    Create an HTTP client with a large keep-alive pool and HTTP/2 enabled.
+    """
+    return httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        # Long read timeout: a streamed answer or a long Whisper upload can take a while
+        timeout=httpx.Timeout(300.0, connect=10.0),
+    )
+
+
+# Shared connection pool for everything that talks to OpenAI
+# (also passed to LangChain's OpenAIEmbeddings in vector_store.py)
+openai_http_client = _build_http_client()
+
 # Single OpenAI client used across your app
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
+openai_client = OpenAI(api_key=OPENAI_API_KEY, http_client=openai_http_client)
 
 # Single Mistral client used across your app
-mistral_client = Mistral(api_key=MISTRAL_API_KEY) if MISTRAL_API_KEY else None
+mistral_client = (
+    Mistral(api_key=MISTRAL_API_KEY, client=_build_http_client())
+    if MISTRAL_API_KEY
+    else None
+)
@@ -1,79 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import gradio as gr
 
 from transcription import transcribe_audio_path
-from summarization import summarize_meeting_with_mistral
+from summarization import stream_summary_with_mistral
 from vector_store import build_vector_store_from_transcript, build_retriever
-from qa import answer_question_with_mistral
+from qa import stream_answer_with_mistral
 
 
 # =========================================================
 # Core functions used by Gradio
 # =========================================================
 
+def _build_retriever_from_transcript(transcript: str):
+    """
+    Build the FAISS vector store for a transcript and return its retriever.
+    """
+    vector_store, embeddings = build_vector_store_from_transcript(transcript)
+    return build_retriever(vector_store, k=4)
+
+
 def process_audio(audio_path: str):
     """
-    Gradio callback:
+    Gradio callback (generator, so the summary streams into the UI):
     - Takes a path to an uploaded audio file
     - Transcribes it with Whisper
-    - Summarizes with Mistral
-    - Builds a FAISS vector store + retriever
+    - Summarizes with Mistral, while building a FAISS vector store +
+      retriever in parallel
 
-    Returns:
+    Yields:
     - transcript_preview (str)
     - summary_markdown (str)
-    - retriever (stored in gr.State for later Q&A)
+    - retriever (stored in gr.State for later Q&A; None until it is built)
+
+    The full transcript is never returned: only the short preview goes to
+    the UI and only the retriever is kept in the session state.
     """
     if not audio_path:
-        return "No audio file uploaded yet.", "", None
+        yield "No audio file uploaded yet.", "", None
+        return
 
     # 1. Transcribe
     try:
         transcript = transcribe_audio_path(audio_path)
     except Exception as e:
-        return f"Error during transcription: {e}", "", None
-
-    # 2. Summarize
-    try:
-        summary = summarize_meeting_with_mistral(transcript)
-    except Exception as e:
-        summary = f"Error during summarization: {e}"
-
-    # 3. Build vector store + retriever
-    try:
-        vector_store, embeddings = build_vector_store_from_transcript(transcript)
-        retriever = build_retriever(vector_store, k=4)
-    except Exception as e:
-        # We still show the transcript preview even if retrieval fails
-        preview = transcript[:1500]
-        error_msg = f"Error while building vector store / retriever: {e}"
-        return preview, error_msg, None
-
-    # 4. Prepare transcript preview for UI
-    transcript_preview = transcript[:1500]
-    if len(transcript) > 1500:
-        transcript_preview += "\n\n...[truncated]"
-
-    return transcript_preview, summary, retriever
+        yield f"Error during transcription: {e}", "", None
+        return
+
+    # 2. Prepare transcript preview for UI (once; every yield below reuses it)
+    transcript_preview = transcript[:1500] + (
+        "\n\n...[truncated]" if len(transcript) > 1500 else ""
+    )
+
+    # 3. Build vector store + retriever in the background.
+    #    It only needs the transcript, so the embeddings calls overlap with
+    #    the summarization calls below instead of waiting for them.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        retriever_future = executor.submit(_build_retriever_from_transcript, transcript)
+
+        # 4. Summarize (show the summary as Mistral writes it)
+        summary = ""
+        try:
+            for delta in stream_summary_with_mistral(transcript):
+                summary += delta
+                yield transcript_preview, summary, None
+        except Exception as e:
+            summary = f"Error during summarization: {e}"
+
+        # Nothing below needs the full transcript: drop our reference so a
+        # long meeting's text can be freed as soon as the index is built.
+        del transcript
+
+        # 5. Wait for the retriever
+        try:
+            retriever = retriever_future.result()
+        except Exception as e:
+            # We still show the transcript preview even if retrieval fails
+            error_msg = f"Error while building vector store / retriever: {e}"
+            yield transcript_preview, error_msg, None
+            return
+
+    yield transcript_preview, summary, retriever
 
 
 def answer_question_ui(question: str, retriever):
     """
-    Gradio callback:
+    Gradio callback (generator, so the answer streams into the UI):
     - Takes a question and the retriever stored in gr.State
     - Uses Mistral to answer based on retrieved transcript chunks
     """
     if retriever is None:
-        return "Please run **Transcribe & Summarize** first so I can build the meeting memory."
+        yield "Please run **Transcribe & Summarize** first so I can build the meeting memory."
+        return
 
     if not question or not question.strip():
-        return "Please enter a question about the meeting."
+        yield "Please enter a question about the meeting."
+        return
 
+    answer = ""
     try:
-        answer = answer_question_with_mistral(question, retriever)
+        for delta in stream_answer_with_mistral(question, retriever):
+            answer += delta
+            yield answer
     except Exception as e:
-        answer = f"Error while answering your question: {e}"
-
-    return answer
+        yield f"Error while answering your question: {e}"
 
 
 # =========================================================
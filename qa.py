@@ -7,13 +7,13 @@ We assume:
 - You already built a retriever from the transcript (FAISS + OpenAI embeddings).
 - You pass that retriever + a question into the function below.
 
-The function:
-- Uses the retriever to get relevant chunks.
-- Sends those chunks + question to Mistral.
-- Returns a grounded, concise answer.
+The functions:
+- Use the retriever to get relevant chunks.
+- Send those chunks + question to Mistral.
+- Stream (or return) a grounded, concise answer.
 """
 
-from typing import Any, List
+from typing import Any, Iterator, List
 
 from langchain_core.documents import Document
 
@@ -21,6 +21,25 @@ from langchain_core.documents import Document
 from config import mistral_client, MISTRAL_CHAT_MODEL
 
 
+# Prompt pieces that never change, built once at import time
+_QA_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "You are a helpful Meeting Assistant. "
+        "You answer questions ONLY using the provided meeting context. "
+        "If the answer is not in the context, say you don't know."
+    ),
+}
+
+_QA_CONTEXT_PREFIX = "Here is context from the meeting transcript:\n\n"
+
+_QA_QUESTION_PREFIX = (
+    "\n\n"
+    "Using ONLY this context, answer the following question:\n\n"
+    "Question: "
+)
+
+
 def _ensure_mistral_client():
     """
     Make sure the Mistral client is configured.
@@ -46,13 +65,17 @@ def _format_context(docs: List[Document], max_chars: int = 4000) -> str:
         if not text:
             continue
 
-        # Add a separator so Mistral can see boundaries
-        chunk = f"- {text}\n"
-        if current_len + len(chunk) > max_chars:
+        # Check the budget before building anything:
+        # each chunk is rendered as "- {text}\n" (3 extra characters)
+        chunk_len = len(text) + 3
+        if current_len + chunk_len > max_chars:
             break
 
-        parts.append(chunk)
-        current_len += len(chunk)
+        # Add a separator so Mistral can see boundaries
+        parts.append("- ")
+        parts.append(text)
+        parts.append("\n")
+        current_len += chunk_len
 
     if not parts:
         return "No relevant context was found in the transcript."
@@ -60,17 +83,20 @@ def _format_context(docs: List[Document], max_chars: int = 4000) -> str:
     return "".join(parts)
 
 
-def answer_question_with_mistral(
+def stream_answer_with_mistral(
     question: str,
     retriever: Any,
     max_context_chars: int = 4000,
-) -> str:
+) -> Iterator[str]:
     """
-    Answer a question about the meeting using:
+    Answer a question about the meeting, streaming the answer as it is generated.
 
     - retriever (FAISS) to fetch relevant transcript chunks
     - Mistral LLM to generate a grounded answer
 
+    Streaming lets the UI show the first words after one round-trip instead
+    of waiting for the full answer.
+
     Parameters
     ----------
     question : str
@@ -80,10 +106,10 @@ def answer_question_with_mistral(
     max_context_chars : int
         Maximum number of characters of context to pass to Mistral.
 
-    Returns
-    -------
+    Yields
+    ------
     str
-        Mistral's answer.
+        Pieces of Mistral's answer, in order.
     """
     _ensure_mistral_client()
 
@@ -92,45 +118,70 @@ def answer_question_with_mistral(
 
 
     if not docs:
-        return "I couldn't find anything in the transcript related to that question."
+        yield "I couldn't find anything in the transcript related to that question."
+        return
 
     context_text = _format_context(docs, max_chars=max_context_chars)
-#                                   ^^^^^^^^
 
 
     # 2) Build prompt for Mistral
     messages = [
-        {
-            "role": "system",
-            "content": (
-                "You are a helpful Meeting Assistant. "
-                "You answer questions ONLY using the provided meeting context. "
-                "If the answer is not in the context, say you don't know."
-            ),
-        },
+        _QA_SYSTEM_MESSAGE,
         {
             "role": "user",
             "content": (
-                "Here is context from the meeting transcript:\n\n"
-                f"{context_text}\n\n"
-                "Using ONLY this context, answer the following question:\n\n"
-                f"Question: {question}"
+                _QA_CONTEXT_PREFIX
+                + context_text
+                + _QA_QUESTION_PREFIX
+                + question
             ),
         },
     ]
 
-    # 3) Call Mistral
+    # 3) Call Mistral (streaming)
     try:
-        response = mistral_client.chat.complete(
+        response = mistral_client.chat.stream(
             model=MISTRAL_CHAT_MODEL,
             messages=messages,
         )
     except Exception as e:
         raise RuntimeError(f"Failed to get answer from Mistral: {e}") from e
 
+    # 4) Forward each token delta as soon as it arrives
     try:
-        answer_text = response.choices[0].message.content
+        for chunk in response:
+            delta = chunk.data.choices[0].delta.content
+            if delta:
+                yield delta
     except Exception as e:
-        raise RuntimeError(f"Unexpected response format from Mistral: {e}") from e
+        raise RuntimeError(f"Failed while streaming answer from Mistral: {e}") from e
+
 
-    return answer_text
+def answer_question_with_mistral(
+    question: str,
+    retriever: Any,
+    max_context_chars: int = 4000,
+) -> str:
+    """
+    Answer a question about the meeting and return the full answer at once.
+
+    Same as stream_answer_with_mistral, but collects the streamed pieces
+    (handy for scripts like qa_main.py).
+
+    Parameters
+    ----------
+    question : str
+        The user's question about the meeting.
+    retriever : Any
+        A LangChain retriever created from your FAISS vector store.
+    max_context_chars : int
+        Maximum number of characters of context to pass to Mistral.
+
+    Returns
+    -------
+    str
+        Mistral's answer.
+    """
+    return "".join(
+        stream_answer_with_mistral(question, retriever, max_context_chars=max_context_chars)
+    )
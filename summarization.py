@@ -5,22 +5,63 @@ Summarize a meeting transcript using Mistral.
 
 We support:
 - Short transcripts: summarize directly in one call.
-- Long transcripts: summarize in chunks, then summarize the summaries
-  (a simple "map-reduce" style).
+- Long transcripts: summarize in chunks (in parallel), then summarize
+  the summaries (a simple "map-reduce" style).
 
 Relies on:
 - mistral_client
 - MISTRAL_CHAT_MODEL
+- MISTRAL_MAX_CONCURRENT_REQUESTS
 
 from config.py
 """
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, List
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 
-from config import mistral_client, MISTRAL_CHAT_MODEL
+from config import mistral_client, MISTRAL_CHAT_MODEL, MISTRAL_MAX_CONCURRENT_REQUESTS
+
+
+# Rough characters-per-token ratio, used to turn character limits into token limits
+CHARS_PER_TOKEN = 4
+
+
+# Prompt pieces that never change, built once at import time.
+# - system: "You are a meeting assistant"
+# - user: "Here is the transcript, please summarize it in a structured way"
+_SUMMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "You are a helpful Meeting Assistant. "
+        "Your job is to read meeting transcripts and produce concise, "
+        "structured summaries that highlight key points, decisions, "
+        "and action items."
+    ),
+}
+
+_SUMMARY_USER_PREFIX = (
+    "Here is a meeting transcript (or part of it). "
+    "Please summarize it in the following structure:\n\n"
+    "1. Overview (2–3 sentences)\n"
+    "2. Key decisions (bullet points)\n"
+    "3. Action items (bullet points, include owner and due date if mentioned)\n\n"
+    "Transcript:\n"
+)
+
+# Used for the final "summary of summaries" step on long transcripts
+_COMBINE_SUMMARIES_PREFIX = (
+    "You have been given summaries of different parts of a long meeting. "
+    "Please combine them into ONE overall meeting summary with the "
+    "same structured format:\n\n"
+    "1. Overview (2–3 sentences)\n"
+    "2. Key decisions (bullet points)\n"
+    "3. Action items (bullet points)\n\n"
+    "Here are the partial summaries:\n\n"
+)
 
 
 def _ensure_mistral_client():
@@ -39,19 +80,20 @@ def _ensure_mistral_client():
         )
 
 
-def _call_mistral_summary(prompt_content: str) -> str:
+def _stream_mistral_summary(prompt_content: str) -> Iterator[str]:
     """
-    Low-level helper that sends a summary request to Mistral.
+    Low-level helper that sends a summary request to Mistral and streams
+    the summary back as it is generated.
 
     Parameters
     ----------
     prompt_content : str
         The text we want Mistral to summarize (transcript or partial transcript).
 
-    Returns
-    -------
+    Yields
+    ------
     str
-        The summary text returned by Mistral.
+        Pieces of the summary text, in order.
 
     Raises
     ------
@@ -60,92 +102,95 @@ def _call_mistral_summary(prompt_content: str) -> str:
     """
     _ensure_mistral_client()
 
-    # We build a simple chat-style prompt:
-    # - system: "You are a meeting assistant"
-    # - user: "Here is the transcript, please summarize it in a structured way"
+    # Simple chat-style prompt: fixed system message + fixed instructions,
+    # only the transcript text changes per call
     messages = [
-        {
-            "role": "system",
-            "content": (
-                "You are a helpful Meeting Assistant. "
-                "Your job is to read meeting transcripts and produce concise, "
-                "structured summaries that highlight key points, decisions, "
-                "and action items."
-            ),
-        },
-        {
-            "role": "user",
-            "content": (
-                "Here is a meeting transcript (or part of it). "
-                "Please summarize it in the following structure:\n\n"
-                "1. Overview (2–3 sentences)\n"
-                "2. Key decisions (bullet points)\n"
-                "3. Action items (bullet points, include owner and due date if mentioned)\n\n"
-                "Transcript:\n"
-                f"{prompt_content}"
-            ),
-        },
+        _SUMMARY_SYSTEM_MESSAGE,
+        {"role": "user", "content": _SUMMARY_USER_PREFIX + prompt_content},
     ]
 
     try:
-        response = mistral_client.chat.complete(
+        response = mistral_client.chat.stream(
             model=MISTRAL_CHAT_MODEL,
             messages=messages,
         )
     except Exception as e:
         raise RuntimeError(f"Failed to get summary from Mistral: {e}") from e
 
-    # The Mistral Python client returns a response object with choices
-    # Each choice has a "message" with "content"
+    # Each streamed event carries a "delta" with the next piece of content
     try:
-        summary_text = response.choices[0].message.content
-
+        for chunk in response:
+            delta = chunk.data.choices[0].delta.content
+            if delta:
+                yield delta
     except Exception as e:
-        raise RuntimeError(f"Unexpected response format from Mistral: {e}") from e
+        raise RuntimeError(f"Failed while streaming summary from Mistral: {e}") from e
 
-    return summary_text
 
+def _call_mistral_summary(prompt_content: str) -> str:
+    """
+    Same as _stream_mistral_summary, but returns the full summary text.
 
-def _split_text(text: str, chunk_size: int = 4000, chunk_overlap: int = 400) -> List[str]:
+    Used for the per-chunk summaries, which nobody reads until they are done.
+    """
+    return "".join(_stream_mistral_summary(prompt_content))
+
+
+@lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """
+    Return a (cached) splitter for summary chunks.
+
+    Mistral's tokenizer isn't in tiktoken, so sizes are estimated with
+    cl100k_base; that's close enough to keep each chunk within one prompt.
+    """
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        encoding_name="cl100k_base",
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ". ", " "],  # try larger breaks first
+    )
+
+
+def _split_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 100) -> List[str]:
     """
     Split a long transcript into smaller chunks of text.
 
     Uses LangChain's RecursiveCharacterTextSplitter to try to break
-    on nice boundaries (paragraphs, sentences, etc.).
+    on nice boundaries (paragraphs, sentences, etc.), measuring chunk
+    size in tokens (tiktoken) rather than characters.
 
     Parameters
     ----------
     text : str
         The full transcript text.
     chunk_size : int
-        Approximate character size of each chunk.
+        Approximate token size of each chunk.
     chunk_overlap : int
-        Overlap in characters between chunks to preserve context.
+        Overlap in tokens between chunks to preserve context.
 
     Returns
     -------
     List[str]
         A list of string chunks.
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        separators=["\n\n", "\n", ". ", " "],  # try larger breaks first
-    )
+    splitter = _get_splitter(chunk_size, chunk_overlap)
 
     chunks = splitter.split_text(text)
     return chunks
 
 
-def summarize_meeting_with_mistral(transcript: str, max_direct_chars: int = 5000) -> str:
+def stream_summary_with_mistral(
+    transcript: str, max_direct_chars: int = 5000
+) -> Iterator[str]:
     """
-    Summarize a meeting transcript using Mistral.
+    Summarize a meeting transcript using Mistral, streaming the final summary.
 
     Behavior:
     - If the transcript is short enough (<= max_direct_chars), send it in one go.
     - If it is longer, we:
         1) Split into chunks
-        2) Summarize each chunk
+        2) Summarize each chunk (several Mistral calls in parallel)
         3) Summarize the summaries into a final high-level summary
 
     Parameters
@@ -156,49 +201,73 @@ def summarize_meeting_with_mistral(transcript: str, max_direct_chars: int = 5000
         Character length threshold for "short" transcripts.
         Above this, we use the chunked (map-reduce style) approach.
 
-    Returns
-    -------
+    Yields
+    ------
     str
-        A structured summary of the meeting.
+        Pieces of the structured meeting summary, in order.
+        (For long transcripts, only the final combined summary is streamed.)
     """
     # Strip leading/trailing whitespace to avoid useless tokens
     transcript = transcript.strip()
 
     if not transcript:
-        return "No transcript content provided to summarize."
+        yield "No transcript content provided to summarize."
+        return
 
     # Case 1: short transcript → single Mistral call
     if len(transcript) <= max_direct_chars:
-        return _call_mistral_summary(transcript)
+        yield from _stream_mistral_summary(transcript)
+        return
 
     # Case 2: long transcript → chunked summarization
 
     # 1) Split into chunks
-    chunks = _split_text(transcript, chunk_size=max_direct_chars, chunk_overlap=300)
-
-    # 2) Summarize each chunk separately
-    partial_summaries: List[str] = []
-    for idx, chunk in enumerate(chunks, start=1):
-        print(f"[summarization] Summarizing chunk {idx}/{len(chunks)}...")
-        partial_summary = _call_mistral_summary(chunk)
-        partial_summaries.append(
-            f"Chunk {idx} summary:\n{partial_summary}"
-        )
+    #    (max_direct_chars is in characters; English averages ~4 characters per token)
+    chunks = _split_text(
+        transcript,
+        chunk_size=max_direct_chars // CHARS_PER_TOKEN,
+        chunk_overlap=300 // CHARS_PER_TOKEN,
+    )
+
+    # 2) Summarize each chunk separately.
+    #    The calls are network-bound, so we overlap them in a thread pool.
+    #    ex.map keeps the results in chunk order.
+    print(f"[summarization] Summarizing {len(chunks)} chunks...")
+    max_workers = max(1, min(MISTRAL_MAX_CONCURRENT_REQUESTS, len(chunks)))
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        chunk_summaries = list(ex.map(_call_mistral_summary, chunks))
+
+    partial_summaries: List[str] = [
+        f"Chunk {idx} summary:\n{partial_summary}"
+        for idx, partial_summary in enumerate(chunk_summaries, start=1)
+    ]
 
     # 3) Combine chunk summaries into one big text
     combined_summaries_text = "\n\n".join(partial_summaries)
 
     # 4) Ask Mistral to summarize the summaries into a final overview
-    final_messages_text = (
-        "You have been given summaries of different parts of a long meeting. "
-        "Please combine them into ONE overall meeting summary with the "
-        "same structured format:\n\n"
-        "1. Overview (2–3 sentences)\n"
-        "2. Key decisions (bullet points)\n"
-        "3. Action items (bullet points)\n\n"
-        "Here are the partial summaries:\n\n"
-        f"{combined_summaries_text}"
-    )
+    final_messages_text = _COMBINE_SUMMARIES_PREFIX + combined_summaries_text
+
+    yield from _stream_mistral_summary(final_messages_text)
+
+
+def summarize_meeting_with_mistral(transcript: str, max_direct_chars: int = 5000) -> str:
+    """
+    Summarize a meeting transcript using Mistral and return the full summary.
+
+    Same as stream_summary_with_mistral, but collects the streamed pieces
+    (handy for scripts like main.py).
+
+    Parameters
+    ----------
+    transcript : str
+        Full meeting transcript text.
+    max_direct_chars : int
+        Character length threshold for "short" transcripts.
 
-    final_summary = _call_mistral_summary(final_messages_text)
-    return final_summary
+    Returns
+    -------
+    str
+        A structured summary of the meeting.
+    """
+    return "".join(stream_summary_with_mistral(transcript, max_direct_chars))
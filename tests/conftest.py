@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Make the app modules (which live in the repo root) importable from tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# config.py refuses to import without a key; tests never call the API
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
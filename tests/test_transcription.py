@@ -0,0 +1,38 @@
+import pytest
+
+from transcription import _merge_segment_texts as merge
+
+
+def test_merge_drops_repeated_overlap():
+    texts = [
+        "Hello there, we decided to ship the new release",
+        "to ship the new release. Next item is the budget",
+    ]
+    assert merge(texts) == (
+        "Hello there, we decided to ship the new release Next item is the budget"
+    )
+
+
+def test_merge_ignores_case_and_punctuation_in_overlap():
+    texts = ["and then Anna said Okay, so", "anna said okay so... we move on"]
+    assert merge(texts) == "and then Anna said Okay, so we move on"
+
+
+@pytest.mark.parametrize(
+    "texts, expected",
+    [
+        (["Let us talk about it.", "It was fine, then."], "Let us talk about it. It was fine, then."),
+        (["I said no", "no one objected"], "I said no no one objected"),
+        (["we looked at the report", "at the end of the day"], "we looked at the report at the end of the day"),
+    ],
+)
+def test_merge_keeps_short_coincidental_matches(texts, expected):
+    assert merge(texts) == expected
+
+
+def test_merge_without_overlap_just_joins():
+    assert merge(["first part", "second part"]) == "first part second part"
+
+
+def test_merge_handles_empty_segments():
+    assert merge(["", "only words here", ""]) == "only words here"
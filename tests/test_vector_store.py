@@ -0,0 +1,71 @@
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores.faiss import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import FakeEmbeddings
+
+from vector_store import _FAISS_STORE_KWARGS, _load_cached_vector_store, _save_vector_store
+
+DIM = 16
+N_VECTORS = 256
+
+
+def _vectors() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    xb = rng.standard_normal((N_VECTORS, DIM)).astype(np.float32)
+    faiss.normalize_L2(xb)
+    return xb
+
+
+def _store(index: faiss.Index) -> FAISS:
+    ids = [str(i) for i in range(index.ntotal)]
+    docs = [Document(page_content=f"chunk {i}") for i in range(index.ntotal)]
+    return FAISS(
+        embedding_function=FakeEmbeddings(size=DIM),
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(ids, docs))),
+        index_to_docstore_id=dict(enumerate(ids)),
+        **_FAISS_STORE_KWARGS,
+    )
+
+
+def _round_trip(index: faiss.Index, cache_path) -> FAISS:
+    _save_vector_store(_store(index), cache_path)
+    loaded = _load_cached_vector_store(cache_path, FakeEmbeddings(size=DIM))
+    assert loaded is not None
+    assert loaded.index.ntotal == N_VECTORS
+    return loaded
+
+
+def test_ivf_index_is_loaded_with_mapped_inverted_lists(tmp_path):
+    xb = _vectors()
+    index = faiss.index_factory(DIM, "IVF4,PQ4", faiss.METRIC_INNER_PRODUCT)
+    index.train(xb)
+    index.add(xb)
+
+    loaded = _round_trip(index, tmp_path / "ivf")
+
+    invlists = faiss.extract_index_ivf(loaded.index).invlists
+    assert isinstance(faiss.downcast_InvertedLists(invlists), faiss.OnDiskInvertedLists)
+
+
+def test_flat_index_round_trips(tmp_path):
+    xb = _vectors()
+    index = faiss.IndexFlatIP(DIM)
+    index.add(xb)
+
+    loaded = _round_trip(index, tmp_path / "flat")
+
+    assert faiss.try_extract_index_ivf(loaded.index) is None
+    hits = loaded.similarity_search_by_vector(xb[3].tolist(), k=1)
+    assert hits[0].page_content == "chunk 3"
+
+
+def test_unreadable_cache_is_removed(tmp_path):
+    cache_path = tmp_path / "broken"
+    cache_path.mkdir()
+    (cache_path / "index.faiss").write_bytes(b"not an index")
+
+    assert _load_cached_vector_store(cache_path, FakeEmbeddings(size=DIM)) is None
+    assert not cache_path.exists()
@@ -6,19 +6,144 @@ Functions to transcribe audio using OpenAI Whisper via the OpenAI Python client.
 We reuse:
 - openai_client
 - OPENAI_WHISPER_MODEL
+- OPENAI_MAX_CONCURRENT_REQUESTS
 
 from config.py
+
+Long recordings are cut into overlapping 60-second segments that are
+transcribed in parallel and stitched back together, instead of waiting
+for one big upload to finish.
+
+Transcripts of files on disk are cached by file hash (see cache.py),
+so re-uploading the same recording skips the Whisper call.
 """
 
-from typing import BinaryIO
+import io
+import os
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, List
+
+from pydub import AudioSegment
+
+from cache import transcript_cache_path
+from config import openai_client, OPENAI_WHISPER_MODEL, OPENAI_MAX_CONCURRENT_REQUESTS
+
+
+# Segment length and overlap for long recordings.
+# The overlap makes sure no word is lost at a cut; we remove the repeat when stitching.
+SEGMENT_SECONDS = 60
+SEGMENT_OVERLAP_SECONDS = 2
+
+# Whisper works on 16 kHz mono internally, so we upload exactly that (~1.9 MB per minute)
+_SEGMENT_FRAME_RATE = 16000
+
+# Longest repeated run of words we look for between two neighbouring segments
+_MAX_OVERLAP_WORDS = 30
+
+# Shortest run we trust as a real overlap. One or two words ("it", "no one")
+# often line up by chance at a seam, and dropping them would lose real speech.
+_MIN_OVERLAP_WORDS = 3
+
+
+def _split_audio_into_segments(file_path: str) -> List[bytes]:
+    """
+    Cut an audio file into overlapping WAV segments (in memory).
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the audio file (any format ffmpeg can read).
+
+    Returns
+    -------
+    List[bytes]
+        WAV-encoded segments in order. A single segment if the recording
+        is shorter than SEGMENT_SECONDS.
+    """
+    # Let ffmpeg downmix/resample while decoding: a 2 h stereo 44.1 kHz
+    # meeting would otherwise take over 1.2 GB of RAM before we shrink it.
+    audio = AudioSegment.from_file(
+        file_path,
+        parameters=["-ac", "1", "-ar", str(_SEGMENT_FRAME_RATE)],
+    )
+    # No-ops after the ffmpeg path; pydub reads .wav files without ffmpeg
+    audio = audio.set_channels(1).set_frame_rate(_SEGMENT_FRAME_RATE)
+
+    segment_ms = SEGMENT_SECONDS * 1000
+    step_ms = (SEGMENT_SECONDS - SEGMENT_OVERLAP_SECONDS) * 1000
+
+    segments: List[bytes] = []
+    for start_ms in range(0, len(audio), step_ms):
+        buffer = io.BytesIO()
+        audio[start_ms:start_ms + segment_ms].export(buffer, format="wav")
+        segments.append(buffer.getvalue())
+
+        if start_ms + segment_ms >= len(audio):
+            break
 
-from config import openai_client, OPENAI_WHISPER_MODEL
+    return segments
+
+
+def _transcribe_segment(indexed_segment: tuple[int, bytes]) -> str:
+    """
+    Send one WAV segment to Whisper and return its text.
+    """
+    idx, wav_bytes = indexed_segment
+    response = openai_client.audio.transcriptions.create(
+        model=OPENAI_WHISPER_MODEL,
+        file=(f"segment_{idx:04d}.wav", wav_bytes),
+    )
+    return response.text
+
+
+def _normalize_word(word: str) -> str:
+    """
+    Lowercase a word and drop punctuation, so "Okay," matches "okay".
+    """
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def _merge_segment_texts(texts: List[str]) -> str:
+    """
+    Join per-segment transcripts, dropping the words repeated in the overlap.
+
+    For each pair of neighbouring segments we find the longest run of words
+    that ends the previous text and starts the next one (ignoring case and
+    punctuation), and keep it only once. Runs shorter than
+    _MIN_OVERLAP_WORDS are treated as coincidence and kept as they are.
+    """
+    merged: List[str] = []
+    merged_norm: List[str] = []
+
+    for text in texts:
+        words = text.split()
+        words_norm = [_normalize_word(w) for w in words]
+
+        overlap = 0
+        longest = min(_MAX_OVERLAP_WORDS, len(merged), len(words))
+        for n in range(longest, _MIN_OVERLAP_WORDS - 1, -1):
+            if merged_norm[-n:] == words_norm[:n]:
+                overlap = n
+                break
+
+        merged.extend(words[overlap:])
+        merged_norm.extend(words_norm[overlap:])
+
+    return " ".join(merged)
 
 
 def transcribe_audio_path(file_path: str) -> str:
     """
     Transcribe an audio file from disk using Whisper.
 
+    Recordings longer than SEGMENT_SECONDS are split into overlapping
+    segments and transcribed in parallel.
+
+    If the same file was transcribed before, the cached transcript is
+    returned instead of calling the API again.
+
     Parameters
     ----------
     file_path : str
@@ -35,18 +160,51 @@ def transcribe_audio_path(file_path: str) -> str:
         If the API call fails.
     """
     try:
-        # Open the file in binary mode ("rb" = read binary)
-        with open(file_path, "rb") as audio_file:
-            response = openai_client.audio.transcriptions.create(
-                model=OPENAI_WHISPER_MODEL,
-                file=audio_file,
-            )
-        # The OpenAI client returns an object with a `.text` attribute
-        return response.text
+        cache_path = transcript_cache_path(file_path)
+        if cache_path.exists():
+            return cache_path.read_text(encoding="utf-8")
+
+        # If the audio can't be decoded locally (e.g. ffmpeg missing),
+        # we still send the original file to Whisper in one request.
+        try:
+            segments = _split_audio_into_segments(file_path)
+        except Exception as e:
+            print(f"[transcription] WARNING: could not split audio, sending it whole: {e}")
+            segments = []
+
+        if len(segments) > 1:
+            # Long recording → transcribe segments in parallel, keep their order
+            max_workers = max(1, min(OPENAI_MAX_CONCURRENT_REQUESTS, len(segments)))
+            with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                segment_texts = list(ex.map(_transcribe_segment, enumerate(segments)))
+            transcript = _merge_segment_texts(segment_texts)
+        else:
+            # Open the file in binary mode ("rb" = read binary)
+            with open(file_path, "rb") as audio_file:
+                response = openai_client.audio.transcriptions.create(
+                    model=OPENAI_WHISPER_MODEL,
+                    file=audio_file,
+                )
+            # The OpenAI client returns an object with a `.text` attribute
+            transcript = response.text
     except Exception as e:
         # Wrap lower-level exceptions in a clear message
         raise RuntimeError(f"Failed to transcribe audio from path '{file_path}': {e}") from e
 
+    # A failed cache write should never fail the transcription itself.
+    # Write to a temporary file and rename it, so a crash mid-write never
+    # leaves a truncated transcript that later uploads would return.
+    tmp_path = cache_path.with_name(f"{cache_path.name}.tmp-{uuid.uuid4().hex}")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(transcript, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        print(f"[transcription] WARNING: could not cache transcript: {e}")
+
+    return transcript
+
 
 def transcribe_audio_filelike(audio_file: BinaryIO) -> str:
     """
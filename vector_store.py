@@ -5,27 +5,149 @@ Builds a vector store and retriever from a meeting transcript using:
 
 - LangChain text splitter
 - OpenAI embeddings
-- FAISS vector store
+- FAISS vector store (index type picked by size: flat, HNSW, or IVF + PQ)
 
 This will be the "memory" that our Meeting Assistant searches.
+
+Built indexes are saved to disk keyed by the transcript hash (see cache.py),
+so re-uploading the same meeting just memory-maps the saved index.
 """
 
-from typing import Tuple
+import math
+import os
+import pickle
+import shutil
+import uuid
+import warnings
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import faiss
+import numpy as np
+from datasketch import MinHash, MinHashLSH
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from langchain_core.documents import Document
 
 from langchain_openai import OpenAIEmbeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores.faiss import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+
+from cache import vector_store_cache_path
+from config import OPENAI_EMBEDDING_MODEL, openai_http_client
+
+
+# Transcript chunking for retrieval, in embedding-model tokens.
+# 250 tokens is roughly 1000 characters (see _split_transcript_to_documents).
+TRANSCRIPT_CHUNK_TOKENS = 250
+TRANSCRIPT_CHUNK_OVERLAP_TOKENS = 50
+
+# How many texts we send per embeddings request (OpenAI allows up to 2048).
+EMBEDDING_BATCH_SIZE = 512
+
+# Index choice by number of chunks (FAISS "Guidelines to choose an index"):
+#   < MAX_VECTORS_FOR_FLAT   → exact flat scan (no build/training cost, fastest here)
+#   < MAX_VECTORS_FOR_HNSW   → HNSW graph over float16 vectors
+#   otherwise                → IVF + PQ (compressed codes, bounded memory)
+MAX_VECTORS_FOR_FLAT = 2_000
+MAX_VECTORS_FOR_HNSW = 100_000
+
+# HNSW graph: 32 neighbours per node is a good default for text embeddings.
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200  # build-time beam width (higher = better graph)
+HNSW_EF_SEARCH = 64  # query-time beam width (higher = better recall, slower)
+
+# HNSW stores vectors as float16 (scalar quantization): 1536 dims = 3 KB per
+# chunk instead of 6 KB, halving the bytes touched per distance computation.
+HNSW_SQ_TYPE = faiss.ScalarQuantizer.QT_fp16
+
+# Product quantization: split each vector into 16 sub-vectors, 8 bits each.
+# (1536-dim float32 = 6 KB per chunk  →  16 bytes per chunk)
+PQ_SUBQUANTIZERS = 16
+
+# FAISS guideline: each IVF centroid should see ~39+ training points.
+MIN_POINTS_PER_CENTROID = 39
+
+
+# Chunks whose word 3-gram sets are at least this similar (Jaccard) count as
+# near-duplicates and are embedded only once.
+NEAR_DUPLICATE_THRESHOLD = 0.9
+_MINHASH_PERMUTATIONS = 128
+_SHINGLE_WORDS = 3
+
 
-from config import OPENAI_EMBEDDING_MODEL
+# Bump whenever the way we build the saved index changes in a way the
+# settings below don't capture (normalization, index parameters, docstore
+# layout, ...), so old cached indexes are rebuilt instead of reused.
+INDEX_CACHE_VERSION = 1
+
+# Part of the cache key: any change here gives the transcript a fresh index
+_INDEX_CACHE_SETTINGS = (
+    f"v{INDEX_CACHE_VERSION}"
+    f";chunk={TRANSCRIPT_CHUNK_TOKENS}/{TRANSCRIPT_CHUNK_OVERLAP_TOKENS}"
+    f";dedup={NEAR_DUPLICATE_THRESHOLD}"
+    f";flat<{MAX_VECTORS_FOR_FLAT};hnsw<{MAX_VECTORS_FOR_HNSW}"
+)
+
+
+# Every index uses inner product over L2-normalized vectors (= cosine similarity).
+# normalize_L2=True makes LangChain normalize query vectors the same way.
+_FAISS_STORE_KWARGS = {
+    "distance_strategy": DistanceStrategy.MAX_INNER_PRODUCT,
+    "normalize_L2": True,
+}
+
+
+# Shared embeddings client, created on first use (see _get_embeddings)
+_embeddings: OpenAIEmbeddings | None = None
+
+# Shared GPU memory/stream pool, created on first use (see _index_to_gpu_if_available)
+_gpu_resources = None
+
+
+def _get_embeddings() -> OpenAIEmbeddings:
+    """
+    Return the shared OpenAIEmbeddings object, creating it on first use.
+
+    Reusing one object across meetings avoids re-creating the underlying
+    HTTP client on every upload. It shares the pooled connections of the
+    app-wide OpenAI client (see config.py).
+    """
+    global _embeddings
+    if _embeddings is None:
+        _embeddings = OpenAIEmbeddings(
+            model=OPENAI_EMBEDDING_MODEL,
+            chunk_size=EMBEDDING_BATCH_SIZE,
+            http_client=openai_http_client,
+            # Our splitter already caps chunks by token count, so skip
+            # LangChain's per-text tiktoken re-encoding and send raw strings
+            check_embedding_ctx_length=False,
+        )
+    return _embeddings
+
+
+@lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """
+    Return a (cached) splitter that counts tokens with the embedding model's
+    own tiktoken encoding, so chunk sizes match what the embeddings API sees.
+    """
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        model_name=OPENAI_EMBEDDING_MODEL,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ". ", " "],  # try to split on sensible boundaries
+    )
 
 
 def _split_transcript_to_documents(
     transcript: str,
-    chunk_size: int = 1000,
-    chunk_overlap: int = 200,
+    chunk_size: int = TRANSCRIPT_CHUNK_TOKENS,
+    chunk_overlap: int = TRANSCRIPT_CHUNK_OVERLAP_TOKENS,
 ) -> list[Document]:
     """
     Split the raw transcript text into smaller chunks.
@@ -35,25 +157,25 @@ def _split_transcript_to_documents(
     - Long transcripts don't fit nicely into a single LLM prompt.
     - Smaller chunks make retrieval more accurate.
 
+    Chunk sizes are measured in tokens of the embedding model (via tiktoken),
+    not characters. 250 tokens is roughly 1000 characters, so the default
+    k=4 retrieved chunks still fit the Q&A context budget (see qa.py).
+
     Parameters
     ----------
     transcript : str
         Full meeting transcript text.
     chunk_size : int
-        Target size (characters) of each chunk.
+        Target size (tokens) of each chunk.
     chunk_overlap : int
-        How many characters to overlap between chunks to keep context.
+        How many tokens to overlap between chunks to keep context.
 
     Returns
     -------
     list[Document]
         A list of LangChain Document objects representing transcript chunks.
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        separators=["\n\n", "\n", ". ", " "],  # try to split on sensible boundaries
-    )
+    splitter = _get_splitter(chunk_size, chunk_overlap)
 
     # We wrap the whole transcript in a single Document first
     base_doc = Document(page_content=transcript, metadata={"source": "meeting_transcript"})
@@ -62,16 +184,255 @@ def _split_transcript_to_documents(
     return docs
 
 
+def _deduplicate_documents(docs: list[Document]) -> list[Document]:
+    """
+    Drop transcript chunks that repeat an earlier chunk.
+
+    Meeting transcripts are full of filler ("okay, so...", "right, right"),
+    and embedding the same content twice costs API calls and adds redundant
+    vectors to the index.
+
+    - Exact duplicates: same text after lowercasing and collapsing whitespace.
+    - Near-duplicates: MinHash over word 3-grams, Jaccard >= NEAR_DUPLICATE_THRESHOLD.
+
+    The first occurrence of each chunk is kept, in the original order.
+    """
+    seen_texts: set[str] = set()
+    lsh = MinHashLSH(threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=_MINHASH_PERMUTATIONS)
+    kept: list[Document] = []
+
+    for idx, doc in enumerate(docs):
+        words = doc.page_content.lower().split()
+        normalized = " ".join(words)
+        if not normalized or normalized in seen_texts:
+            continue
+        seen_texts.add(normalized)
+
+        shingles = {
+            " ".join(words[i:i + _SHINGLE_WORDS])
+            for i in range(max(1, len(words) - _SHINGLE_WORDS + 1))
+        }
+        minhash = MinHash(num_perm=_MINHASH_PERMUTATIONS)
+        minhash.update_batch([shingle.encode("utf-8") for shingle in shingles])
+        if lsh.query(minhash):
+            continue
+
+        lsh.insert(str(idx), minhash)
+        kept.append(doc)
+
+    return kept
+
+
+def _choose_nlist(n_vectors: int) -> int:
+    """
+    Pick the number of IVF lists (clusters) for a given number of vectors.
+
+    Follows the FAISS "Guidelines to choose an index":
+    - nlist around 4 * sqrt(N)
+    - but never so many lists that a centroid gets fewer than ~39 training points
+    """
+    nlist = int(4 * math.sqrt(n_vectors))
+    return max(1, min(nlist, n_vectors // MIN_POINTS_PER_CENTROID))
+
+
+def _build_faiss_index(xb: np.ndarray) -> faiss.Index:
+    """
+    Build (and train, if needed) a FAISS index over the embedding matrix.
+
+    - Typical meetings (< MAX_VECTORS_FOR_FLAT chunks): exact IndexFlatIP.
+      A scan over a few thousand vectors is faster than building a graph,
+      and there is nothing to train.
+    - Large collections (< MAX_VECTORS_FOR_HNSW): HNSW graph over float16
+      vectors, which answers k-NN queries with a few graph hops.
+    - Huge collections: IVF + PQ, which only scans a few clusters per query
+      and stores compressed 16-byte codes instead of full float32 vectors.
+
+    Parameters
+    ----------
+    xb : np.ndarray
+        float32 matrix of shape (n_chunks, dim), rows L2-normalized.
+
+    Returns
+    -------
+    faiss.Index
+        An index with all vectors added.
+    """
+    n_vectors, dim = xb.shape
+
+    if n_vectors < MAX_VECTORS_FOR_FLAT:
+        index = faiss.IndexFlatIP(dim)
+    elif n_vectors < MAX_VECTORS_FOR_HNSW or dim % PQ_SUBQUANTIZERS != 0:
+        index = faiss.IndexHNSWSQ(dim, HNSW_SQ_TYPE, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        # fp16 has no real parameters to learn, but FAISS still expects train()
+        index.train(xb)
+    else:
+        nlist = _choose_nlist(n_vectors)
+        index = faiss.index_factory(
+            dim,
+            f"IVF{nlist},PQ{PQ_SUBQUANTIZERS}",
+            faiss.METRIC_INNER_PRODUCT,
+        )
+        index.train(xb)
+
+        # Probe ~10% of the clusters per query (default of 1 hurts recall)
+        ivf = faiss.extract_index_ivf(index)
+        ivf.nprobe = max(1, nlist // 10)
+        # MMR retrieval reconstructs candidate vectors by id, which IVF only
+        # supports with a direct map (maintained from here on by add())
+        ivf.make_direct_map()
+
+    index.add(xb)
+    return index
+
+
+def _index_to_gpu_if_available(index: faiss.Index) -> faiss.Index:
+    """
+    Copy the index to GPU 0 when a FAISS GPU build and a GPU are available.
+
+    Otherwise (faiss-cpu, no GPU, or an index type without GPU support such
+    as HNSW) the CPU index is returned unchanged.
+    """
+    global _gpu_resources
+
+    if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+        return index
+    if isinstance(index, faiss.IndexHNSW):
+        return index
+
+    try:
+        if _gpu_resources is None:
+            _gpu_resources = faiss.StandardGpuResources()
+        options = faiss.GpuClonerOptions()
+        options.useFloat16 = True  # PQ lookup tables for 96-dim sub-vectors need fp16
+        return faiss.index_cpu_to_gpu(_gpu_resources, 0, index, options)
+    except Exception as e:
+        print(f"[vector_store] WARNING: keeping FAISS index on CPU: {e}")
+        return index
+
+
+@contextmanager
+def _ignore_normalize_l2_warning() -> Iterator[None]:
+    """
+    Hide LangChain's "Normalizing L2 is not applicable" warning.
+
+    We normalize on purpose: on unit vectors, inner product = cosine similarity.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="Normalizing L2 is not applicable")
+        yield
+
+
+def _read_index_mmap(index_path: Path) -> faiss.Index:
+    """
+    Read a saved index memory-mapped, using the flag that fits its type.
+
+    - Flat and HNSW indexes (vectors stored as flat codes): IO_FLAG_MMAP_IFC
+      maps the codes themselves. Plain IO_FLAG_MMAP would copy them into
+      private memory.
+    - IVF indexes: IO_FLAG_MMAP_IFC still loads the inverted lists into
+      private memory (ArrayInvertedLists). So once we see an IVF index we
+      reopen it with IO_FLAG_MMAP | IO_FLAG_READ_ONLY, which maps the lists
+      from the file (OnDiskInvertedLists).
+
+    The first read is zero-copy for flat/HNSW. For IVF + PQ it only holds
+    the small PQ codes, so probing this way is cheap for every index type.
+    """
+    ivf_flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+
+    # IO_FLAG_MMAP_IFC only exists in recent FAISS releases
+    mmap_ifc = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+    if mmap_ifc is None:
+        return faiss.read_index(str(index_path), ivf_flags)
+
+    index = faiss.read_index(str(index_path), mmap_ifc)
+    if faiss.try_extract_index_ivf(index) is None:
+        return index
+
+    del index  # release the private copy before mapping the file
+    return faiss.read_index(str(index_path), ivf_flags)
+
+
+def _load_cached_vector_store(
+    cache_path: Path, embeddings: OpenAIEmbeddings
+) -> FAISS | None:
+    """
+    Load a previously saved vector store, or return None on a cache miss.
+    An incomplete or unreadable cache folder is deleted and counts as a miss.
+
+    The index is opened memory-mapped (see _read_index_mmap), so its vectors
+    stay in the OS page cache and are shared by every process serving the
+    same meeting, instead of one private copy each.
+
+    The cache folder is written only by this app (see _save_vector_store),
+    which is why unpickling the docstore is safe here.
+    """
+    if not cache_path.exists():
+        return None
+
+    index_path = cache_path / "index.faiss"
+    docstore_path = cache_path / "index.pkl"
+
+    try:
+        index = _read_index_mmap(index_path)
+
+        # Same layout as FAISS.save_local: (docstore, index_to_docstore_id)
+        with open(docstore_path, "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+        with _ignore_normalize_l2_warning():
+            return FAISS(
+                embedding_function=embeddings,
+                index=index,
+                docstore=docstore,
+                index_to_docstore_id=index_to_docstore_id,
+                **_FAISS_STORE_KWARGS,
+            )
+    except Exception as e:
+        # Remove the broken folder, otherwise _save_vector_store could never
+        # replace it and this meeting would be re-embedded on every upload
+        print(f"[vector_store] WARNING: removing unreadable cache {cache_path}: {e}")
+        shutil.rmtree(cache_path, ignore_errors=True)
+        return None
+
+
+def _save_vector_store(vector_store: FAISS, cache_path: Path) -> None:
+    """
+    Save a vector store to the cache folder.
+
+    We write to a temporary folder first and rename it, so a crash mid-save
+    never leaves a half-written index behind. Failures are only logged.
+    """
+    tmp_path = cache_path.with_name(f"{cache_path.name}.tmp-{uuid.uuid4().hex}")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        vector_store.save_local(str(tmp_path))
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        # faiss.write_index raises RuntimeError (not OSError) on write errors
+        print(f"[vector_store] WARNING: could not cache vector store: {e}")
+    finally:
+        # Gone after a successful rename; leftovers after any failure
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
 def build_vector_store_from_transcript(
     transcript: str,
 ) -> Tuple[FAISS, OpenAIEmbeddings]:
     """
     Build a FAISS vector store from a meeting transcript.
 
+    If this transcript was indexed before, the saved index is loaded from
+    disk instead.
+
     Steps:
-    1. Split transcript into Document chunks.
-    2. Create OpenAI embeddings.
-    3. Use FAISS to store vectors + documents.
+    1. Split transcript into Document chunks (duplicates removed).
+    2. Embed all chunks with OpenAI embeddings (batched requests)
+       and L2-normalize them (cosine similarity via inner product).
+    3. Build a FAISS index (flat, HNSW, or IVF + PQ depending on size).
+    4. Wrap it in a LangChain FAISS vector store.
+    5. Save it to the on-disk cache, then move it to GPU if one is available.
 
     Parameters
     ----------
@@ -84,43 +445,97 @@ def build_vector_store_from_transcript(
         vector_store : FAISS
             The in-memory FAISS vector store with all chunks indexed.
         embeddings : OpenAIEmbeddings
-            The embeddings object (useful if you want to reuse it later).
+            The shared embeddings object (useful if you want to reuse it later).
     """
-    # 1) Split into chunks
-    docs = _split_transcript_to_documents(transcript)
+    # Reuse the shared embeddings object (calls the OpenAI embeddings API)
+    embeddings = _get_embeddings()
+
+    # 0) Same transcript seen before? Load its index from disk.
+    cache_path = vector_store_cache_path(transcript, _INDEX_CACHE_SETTINGS)
+    vector_store = _load_cached_vector_store(cache_path, embeddings)
+    if vector_store is not None:
+        vector_store.index = _index_to_gpu_if_available(vector_store.index)
+        return vector_store, embeddings
+
+    # 1) Split into chunks, dropping repeated ones
+    docs = _deduplicate_documents(_split_transcript_to_documents(transcript))
 
-    # 2) Configure embeddings (this will call the OpenAI embeddings API under the hood)
-    embeddings = OpenAIEmbeddings(model=OPENAI_EMBEDDING_MODEL)
+    # 2) Embed chunks in batches of EMBEDDING_BATCH_SIZE, straight into one
+    #    contiguous float32 matrix (no per-row conversion inside LangChain)
+    texts = [doc.page_content for doc in docs]
+    xb = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    faiss.normalize_L2(xb)  # in place; makes inner product = cosine similarity
 
-    # 3) Build FAISS vector store from documents
-    vector_store = FAISS.from_documents(docs, embeddings)
+    # 3) Build the FAISS index ourselves
+    #    (FAISS.from_documents always uses an exhaustive IndexFlatL2)
+    index = _build_faiss_index(xb)
+
+    # 4) Wrap the index so it behaves like any other LangChain vector store
+    ids = [str(uuid.uuid4()) for _ in docs]
+    with _ignore_normalize_l2_warning():
+        vector_store = FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=InMemoryDocstore(dict(zip(ids, docs))),
+            index_to_docstore_id=dict(enumerate(ids)),
+            **_FAISS_STORE_KWARGS,
+        )
+
+    # 5) Save for the next time this meeting is uploaded
+    #    (before moving to GPU: only CPU indexes can be written to disk)
+    _save_vector_store(vector_store, cache_path)
+    vector_store.index = _index_to_gpu_if_available(vector_store.index)
 
     return vector_store, embeddings
 
 
-def build_retriever(vector_store: FAISS, k: int = 4):
+def build_retriever(
+    vector_store: FAISS,
+    k: int = 4,
+    ef_search: int = HNSW_EF_SEARCH,
+    fetch_k: int = 20,
+    lambda_mult: float = 0.5,
+):
     """
     Create a retriever from an existing vector store.
 
     The retriever will:
     - Take a user question (string)
     - Embed it using the same embeddings
-    - Perform similarity search in the FAISS index
-    - Return the top-k most relevant documents
+    - Fetch the fetch_k most similar chunks from the FAISS index
+    - Return k of them picked with Max-Marginal-Relevance (MMR):
+      relevant to the question, but not repeating each other
 
     Parameters
     ----------
     vector_store : FAISS
         The FAISS vector store previously built from the transcript.
     k : int
-        How many chunks to return for each query (top-k).
+        How many chunks to return for each query.
+    ef_search : int
+        HNSW query-time beam width. Higher = better recall, slower search.
+        Only used by HNSW indexes (MAX_VECTORS_FOR_FLAT chunks and up);
+        never set below fetch_k.
+    fetch_k : int
+        How many candidate chunks MMR chooses from.
+    lambda_mult : float
+        0 = maximum diversity, 1 = pure similarity (plain top-k).
 
     Returns
     -------
     retriever
         A LangChain retriever object, ready to plug into a RAG chain.
     """
+    if isinstance(vector_store.index, faiss.IndexHNSW):
+        # efSearch must be at least fetch_k, otherwise HNSW can't return enough candidates
+        vector_store.index.hnsw.efSearch = max(ef_search, fetch_k, k)
+
     retriever = vector_store.as_retriever(
-        search_kwargs={"k": k},  # number of chunks to retrieve per question
+        search_type="mmr",
+        search_kwargs={
+            "k": k,  # number of chunks to retrieve per question
+            "fetch_k": fetch_k,
+            "lambda_mult": lambda_mult,
+        },
     )
     return retriever